@@ -1,8 +1,17 @@
+import hashlib
 import os
-from flask import Flask, request, jsonify
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Import model trainers and predictors
 from models.lstm_model import LSTMModel
@@ -11,24 +20,154 @@ from models.time_series_predictor import TimeSeriesPredictor
 # Load environment variables
 load_dotenv('../.env')
 
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, serializing numpy arrays natively"""
+
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
 
 # Configuration
 BACKEND_URL = os.getenv('BACKEND_URL', 'http://localhost:5000')
 MODEL_STORAGE_PATH = os.getenv('MODEL_STORAGE_PATH', './saved_models')
 
+# Health payload is static, so frequent probers can revalidate it with a 304
+HEALTH_JSON = orjson.dumps({
+    'status': 'healthy',
+    'service': 'AI Time Machines Python Service',
+    'version': '1.0.0'
+}, option=ORJSONProvider.option)
+HEALTH_ETAG = hashlib.sha1(HEALTH_JSON).hexdigest()
+
+# Available model types, serialized once since the list never changes
+MODEL_TYPES = [
+    {
+        'type': 'lstm',
+        'name': 'LSTM',
+        'description': 'Long Short-Term Memory neural network for time series forecasting'
+    },
+    {
+        'type': 'gru',
+        'name': 'GRU',
+        'description': 'Gated Recurrent Unit for efficient time series prediction'
+    },
+    {
+        'type': 'arima',
+        'name': 'ARIMA',
+        'description': 'AutoRegressive Integrated Moving Average for statistical forecasting'
+    },
+    {
+        'type': 'prophet',
+        'name': 'Prophet',
+        'description': 'Facebook Prophet for time series with strong seasonal patterns'
+    },
+    {
+        'type': 'transformer',
+        'name': 'Transformer',
+        'description': 'Transformer-based model for complex time series patterns'
+    }
+]
+MODEL_TYPES_JSON = orjson.dumps({'models': MODEL_TYPES}, option=ORJSONProvider.option)
+MODEL_TYPES_ETAG = hashlib.sha1(MODEL_TYPES_JSON).hexdigest()
+
 # Ensure model storage directory exists
 os.makedirs(MODEL_STORAGE_PATH, exist_ok=True)
 
+# Shared HTTP session so backend notifications reuse pooled connections
+backend_adapter = HTTPAdapter(
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=['PUT']
+    )
+)
+backend_session = requests.Session()
+backend_session.mount('http://', backend_adapter)
+backend_session.mount('https://', backend_adapter)
+
+# Notifications run off the request thread so responses don't wait on the backend
+notify_executor = ThreadPoolExecutor(max_workers=4)
+
+def _put_model_status(model_id, payload):
+    """Send a model status update to the backend"""
+    try:
+        backend_session.put(
+            f'{BACKEND_URL}/api/models/{model_id}/status',
+            json=payload,
+            timeout=5
+        )
+    except Exception as e:
+        print(f'Failed to notify backend: {str(e)}')
+
+def notify_backend(model_id, payload):
+    """Queue a model status update for the backend"""
+    notify_executor.submit(_put_model_status, model_id, payload)
+
+# Loaded predictors pooled per model file, least recently used first:
+# {model_path: (mtime, [idle predictors])}
+MAX_POOLED_MODELS = int(os.getenv('MAX_POOLED_MODELS', 8))
+MAX_IDLE_PREDICTORS = int(os.getenv('MAX_IDLE_PREDICTORS', 2))
+predictor_pool = OrderedDict()
+predictor_pool_lock = threading.Lock()
+
+def acquire_predictor(model_path, model_type):
+    """Take an idle loaded predictor for model_path, loading a new one if none is free"""
+    mtime = os.path.getmtime(model_path)
+    with predictor_pool_lock:
+        entry = predictor_pool.get(model_path)
+        if entry is not None and entry[0] == mtime and entry[1]:
+            predictor_pool.move_to_end(model_path)
+            return entry[1].pop(), mtime
+
+    predictor = TimeSeriesPredictor(model_type=model_type)
+    predictor.load(model_path)
+    return predictor, mtime
+
+def release_predictor(model_path, mtime, predictor):
+    """Return a loaded predictor to its model's pool, evicting least recently used models"""
+    with predictor_pool_lock:
+        entry = predictor_pool.get(model_path)
+        if entry is not None and mtime < entry[0]:
+            # Loaded before a retrain finished: its weights are stale, don't pool it
+            return
+        if entry is None or mtime > entry[0]:
+            # New or retrained model file: drop predictors holding older weights
+            entry = predictor_pool[model_path] = (mtime, [])
+        predictor_pool.move_to_end(model_path)
+
+        if len(entry[1]) < MAX_IDLE_PREDICTORS:
+            entry[1].append(predictor)
+        while len(predictor_pool) > MAX_POOLED_MODELS:
+            predictor_pool.popitem(last=False)
+
+def extract_input_values(input_data):
+    """Convert request input data into a contiguous float64 array of values"""
+    if input_data is None:
+        return np.empty(0)
+    if isinstance(input_data, dict):
+        # Column form: {"values": [...], "timestamps": [...]}
+        return np.asarray(input_data.get('values', []), dtype=np.float64)
+    return np.asarray(
+        [point['value'] if isinstance(point, dict) else point for point in input_data],
+        dtype=np.float64
+    )
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'AI Time Machines Python Service',
-        'version': '1.0.0'
-    }), 200
+    response = Response(HEALTH_JSON, status=200, mimetype='application/json')
+    response.set_etag(HEALTH_ETAG)
+    return response.make_conditional(request)
 
 @app.route('/api/train', methods=['POST'])
 def train_model():
@@ -54,22 +193,16 @@ def train_model():
         )
 
         # Save model
-        model_path = os.path.join(MODEL_STORAGE_PATH, f'{model_id}.pkl')
+        model_path = os.path.join(MODEL_STORAGE_PATH, f'{model_id}.json')
         predictor.save(model_path)
 
         # Notify backend of completion
-        try:
-            requests.put(
-                f'{BACKEND_URL}/api/models/{model_id}/status',
-                json={
-                    'status': 'completed',
-                    'metrics': metrics,
-                    'modelPath': model_path,
-                    'trainingDuration': metrics.get('training_time', 0)
-                }
-            )
-        except Exception as e:
-            print(f'Failed to notify backend: {str(e)}')
+        notify_backend(model_id, {
+            'status': 'completed',
+            'metrics': metrics,
+            'modelPath': model_path,
+            'trainingDuration': metrics.get('training_time', 0)
+        })
 
         return jsonify({
             'message': 'Model trained successfully',
@@ -79,14 +212,8 @@ def train_model():
 
     except Exception as e:
         # Notify backend of failure
-        try:
-            if 'model_id' in locals():
-                requests.put(
-                    f'{BACKEND_URL}/api/models/{model_id}/status',
-                    json={'status': 'failed'}
-                )
-        except:
-            pass
+        if 'model_id' in locals():
+            notify_backend(model_id, {'status': 'failed'})
 
         return jsonify({'error': str(e)}), 500
 
@@ -98,21 +225,21 @@ def generate_prediction():
         model_id = data.get('modelId')
         model_path = data.get('modelPath')
         model_type = data.get('modelType', 'lstm')
-        input_data = data.get('inputData')
+        input_values = extract_input_values(data.get('inputData'))
         horizon = data.get('horizon', 10)
 
         if not model_path or not os.path.exists(model_path):
             return jsonify({'error': 'Model not found'}), 404
 
-        # Initialize predictor and load model
-        predictor = TimeSeriesPredictor(model_type=model_type)
-        predictor.load(model_path)
-
-        # Generate predictions
-        predictions, confidence = predictor.predict(
-            input_data=input_data,
-            horizon=horizon
-        )
+        # Reuse a pooled predictor for this model, loading one only when none is idle
+        predictor, mtime = acquire_predictor(model_path, model_type)
+        try:
+            predictions, confidence = predictor.predict(
+                input_data=input_values,
+                horizon=horizon
+            )
+        finally:
+            release_predictor(model_path, mtime, predictor)
 
         return jsonify({
             'predictions': predictions,
@@ -126,35 +253,11 @@ def generate_prediction():
 @app.route('/api/models/types', methods=['GET'])
 def get_model_types():
     """Get available model types and their descriptions"""
-    return jsonify({
-        'models': [
-            {
-                'type': 'lstm',
-                'name': 'LSTM',
-                'description': 'Long Short-Term Memory neural network for time series forecasting'
-            },
-            {
-                'type': 'gru',
-                'name': 'GRU',
-                'description': 'Gated Recurrent Unit for efficient time series prediction'
-            },
-            {
-                'type': 'arima',
-                'name': 'ARIMA',
-                'description': 'AutoRegressive Integrated Moving Average for statistical forecasting'
-            },
-            {
-                'type': 'prophet',
-                'name': 'Prophet',
-                'description': 'Facebook Prophet for time series with strong seasonal patterns'
-            },
-            {
-                'type': 'transformer',
-                'name': 'Transformer',
-                'description': 'Transformer-based model for complex time series patterns'
-            }
-        ]
-    }), 200
+    response = Response(MODEL_TYPES_JSON, status=200, mimetype='application/json')
+    response.set_etag(MODEL_TYPES_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
     port = int(os.getenv('PYTHON_SERVICE_PORT', 8000))
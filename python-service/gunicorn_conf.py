@@ -0,0 +1,28 @@
+# Gunicorn configuration for the Python ML service
+import os
+
+# Cores this process may run on (honours Docker --cpuset-cpus, unlike os.cpu_count)
+cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+bind = f"0.0.0.0:{os.getenv('PYTHON_SERVICE_PORT', '8000')}"
+
+# Each worker holds its own TensorFlow runtime and predictor pool, so keep the
+# process count small and get request concurrency from threads instead
+workers = int(os.getenv('GUNICORN_WORKERS', 2))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# Worker heartbeat timeout: gthread workers keep heartbeating while a request
+# thread is busy, so this does not cap how long a training request may run
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+
+# Import TensorFlow and the app once in the master; workers share it via fork
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Give each worker an equal share of the cores for TensorFlow ops"""
+    import tensorflow as tf
+
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    tf.config.threading.set_intra_op_parallelism_threads(max(1, cpu_count // workers))
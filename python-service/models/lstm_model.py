@@ -1,4 +1,6 @@
+import os
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 import tensorflow as tf
@@ -15,6 +17,7 @@ class LSTMModel:
         self.units = units
         self.dropout = dropout
         self.model = None
+        self.interpreter = None
         self.scaler = MinMaxScaler()
 
     def prepare_data(self, data, test_size=0.2):
@@ -24,18 +27,16 @@ class LSTMModel:
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         df = df.sort_values('timestamp')
 
-        # Extract values and scale
-        values = df['value'].values.reshape(-1, 1)
-        scaled_values = self.scaler.fit_transform(values)
+        if len(df) <= self.sequence_length:
+            raise ValueError(f"Need more than {self.sequence_length} data points to train")
 
-        # Create sequences
-        X, y = [], []
-        for i in range(len(scaled_values) - self.sequence_length):
-            X.append(scaled_values[i:i + self.sequence_length])
-            y.append(scaled_values[i + self.sequence_length])
+        # Extract values and scale once into a flat float32 series
+        values = df['value'].values.reshape(-1, 1)
+        scaled_values = self.scaler.fit_transform(values).astype(np.float32).ravel()
 
-        X = np.array(X)
-        y = np.array(y)
+        # Create sequences as strided views over the series (no per-window copies)
+        X = sliding_window_view(scaled_values[:-1], self.sequence_length)[..., np.newaxis]
+        y = scaled_values[self.sequence_length:, np.newaxis]
 
         # Split train/test
         split_idx = int(len(X) * (1 - test_size))
@@ -98,25 +99,99 @@ class LSTMModel:
             'epochs': epochs
         }
 
+    def _predict_step(self, window):
+        """Run a single forward pass over a (1, sequence_length, 1) window"""
+        if self.interpreter is not None:
+            # The fused TFLite LSTM keeps its state tensors between invocations
+            self.interpreter.reset_all_variables()
+            self.interpreter.set_tensor(self._input_index, window)
+            self.interpreter.invoke()
+            return self.interpreter.get_tensor(self._output_index)[0, 0]
+        return self.model.predict(window, verbose=0)[0, 0]
+
     def predict(self, input_sequence, horizon=10):
         """Generate predictions for future time steps"""
-        if self.model is None:
+        if self.model is None and self.interpreter is None:
             raise ValueError("Model not trained or loaded")
 
-        # Ensure input is properly shaped
-        current_sequence = np.array(input_sequence[-self.sequence_length:]).reshape(-1, 1)
-        current_sequence = self.scaler.transform(current_sequence)
+        # Scale the latest window into a preallocated model input buffer
+        recent = np.asarray(input_sequence[-self.sequence_length:], dtype=np.float64).reshape(-1, 1)
+        window = np.empty((1, self.sequence_length, 1), dtype=np.float32)
+        window[0] = self.scaler.transform(recent)
 
-        predictions = []
-        for _ in range(horizon):
+        predictions = np.empty(horizon)
+        for step in range(horizon):
             # Predict next value
-            pred = self.model.predict(current_sequence.reshape(1, self.sequence_length, 1), verbose=0)
-            predictions.append(pred[0, 0])
+            pred = self._predict_step(window)
+            predictions[step] = pred
 
-            # Update sequence with prediction
-            current_sequence = np.append(current_sequence[1:], pred).reshape(-1, 1)
+            # Shift the window left in place and append the prediction
+            window[0, :-1] = window[0, 1:]
+            window[0, -1] = pred
 
         # Inverse transform predictions
-        predictions = self.scaler.inverse_transform(np.array(predictions).reshape(-1, 1))
+        predictions = self.scaler.inverse_transform(predictions.reshape(-1, 1))
+
+        return predictions.flatten()
+
+    def get_params(self):
+        """Return architecture and fitted scaler parameters as plain JSON types"""
+        return {
+            'sequence_length': self.sequence_length,
+            'units': self.units,
+            'dropout': self.dropout,
+            'scaler': {
+                'min_': self.scaler.min_.tolist(),
+                'scale_': self.scaler.scale_.tolist(),
+                'data_min_': self.scaler.data_min_.tolist(),
+                'data_max_': self.scaler.data_max_.tolist(),
+                'data_range_': self.scaler.data_range_.tolist(),
+                'n_samples_seen_': int(self.scaler.n_samples_seen_)
+            }
+        }
+
+    def set_params(self, params):
+        """Restore architecture and scaler state without re-fitting"""
+        self.sequence_length = params['sequence_length']
+        self.units = params['units']
+        self.dropout = params['dropout']
+
+        scaler_params = params['scaler']
+        for attr in ('min_', 'scale_', 'data_min_', 'data_max_', 'data_range_'):
+            setattr(self.scaler, attr, np.array(scaler_params[attr]))
+        self.scaler.n_samples_seen_ = scaler_params['n_samples_seen_']
+        self.scaler.n_features_in_ = len(scaler_params['min_'])
+
+    @staticmethod
+    def _tflite_path(path):
+        """Path of the TFLite inference model stored next to the Keras file"""
+        return os.path.splitext(path)[0] + '.tflite'
+
+    def save(self, path):
+        """Save the Keras model in native format plus a TFLite copy for inference"""
+        if self.model is None:
+            raise ValueError("Model not trained or loaded")
+        self.model.save(path)
 
-        return predictions.flatten().tolist()
+        # Fix the batch size to 1 (the rollout shape) so the LSTM converts to a fused op
+        forward = tf.function(lambda x: self.model(x, training=False))
+        concrete = forward.get_concrete_function(
+            tf.TensorSpec([1, self.sequence_length, 1], tf.float32)
+        )
+        converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete], self.model)
+        # Dynamic-range quantization: int8 weights, float activations
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        with open(self._tflite_path(path), 'wb') as f:
+            f.write(converter.convert())
+
+    def load(self, path):
+        """Load the model, preferring the lightweight TFLite interpreter"""
+        tflite_path = self._tflite_path(path)
+        if not os.path.exists(tflite_path):
+            self.model = keras.models.load_model(path, compile=False)
+            return
+
+        self.interpreter = tf.lite.Interpreter(model_path=tflite_path, num_threads=1)
+        self.interpreter.allocate_tensors()
+        self._input_index = self.interpreter.get_input_details()[0]['index']
+        self._output_index = self.interpreter.get_output_details()[0]['index']
@@ -1,7 +1,16 @@
-import joblib
+import contextlib
+import json
+import os
+import uuid
 import numpy as np
 from models.lstm_model import LSTMModel
 
+# Multipliers for the placeholder lower/upper confidence bounds
+CONFIDENCE_FACTORS = np.array([0.9, 1.1])
+
+# Models trained before the Keras/JSON format were joblib pickles
+LEGACY_MODEL_ERROR = "model saved in legacy pickle format; retrain it"
+
 
 class TimeSeriesPredictor:
     """Unified interface for different time series models"""
@@ -57,23 +66,18 @@ class TimeSeriesPredictor:
         return metrics
 
     def predict(self, input_data, horizon=10):
-        """Generate predictions"""
+        """Generate predictions from a 1-D array of input values"""
         if self.model is None:
             raise ValueError("Model not initialized or loaded")
 
         if self.model_type in ['lstm', 'gru']:
-            # Extract values from input data
-            if isinstance(input_data, list):
-                values = [point['value'] if isinstance(point, dict) else point for point in input_data]
-            else:
-                values = input_data
-
-            predictions = self.model.predict(values, horizon=horizon)
+            predictions = self.model.predict(input_data, horizon=horizon)
 
             # Calculate simple confidence intervals (placeholder)
+            lower, upper = np.multiply.outer(CONFIDENCE_FACTORS, predictions)
             confidence = {
-                'lower': [p * 0.9 for p in predictions],
-                'upper': [p * 1.1 for p in predictions]
+                'lower': lower,
+                'upper': upper
             }
 
             return predictions, confidence
@@ -81,15 +85,66 @@ class TimeSeriesPredictor:
             # Placeholder for other model types
             return [], {}
 
+    @staticmethod
+    def _read_metadata(path):
+        """Read the JSON metadata file, rejecting joblib-era pickles"""
+        if path.endswith('.pkl'):
+            raise ValueError(LEGACY_MODEL_ERROR)
+
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ValueError(LEGACY_MODEL_ERROR)
+
+    @staticmethod
+    def _weights_path(path, metadata):
+        """Path of the Keras file referenced by the metadata file at path"""
+        if 'weights' in metadata:
+            return os.path.join(os.path.dirname(path), metadata['weights'])
+        # Models saved before weights were versioned sit next to the metadata file
+        return os.path.splitext(path)[0] + '.keras'
+
     def save(self, path):
-        """Save the trained model"""
-        joblib.dump({
-            'model_type': self.model_type,
-            'model': self.model
-        }, path)
+        """Save the trained model.
+
+        Weights go to uniquely named files and the metadata file is swapped in
+        atomically last, so a concurrent load always pairs a scaler with the
+        weights it was trained with.
+        """
+        try:
+            previous = self._read_metadata(path)
+        except (OSError, ValueError):
+            previous = None
+
+        version = uuid.uuid4().hex[:12]
+        metadata = {'model_type': self.model_type}
+
+        if isinstance(self.model, LSTMModel):
+            weights_name = f'{os.path.splitext(os.path.basename(path))[0]}.{version}.keras'
+            self.model.save(os.path.join(os.path.dirname(path), weights_name))
+            metadata['weights'] = weights_name
+            metadata['params'] = self.model.get_params()
+
+        tmp_path = f'{path}.{version}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, path)
+
+        # Remove the weights the replaced metadata pointed at
+        if previous is not None and previous.get('model_type') in ('lstm', 'gru'):
+            old_weights = self._weights_path(path, previous)
+            for old_file in (old_weights, LSTMModel._tflite_path(old_weights)):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(old_file)
 
     def load(self, path):
         """Load a trained model"""
-        saved_data = joblib.load(path)
-        self.model_type = saved_data['model_type']
-        self.model = saved_data['model']
+        metadata = self._read_metadata(path)
+
+        self.model_type = metadata['model_type']
+        self._initialize_model()
+
+        if isinstance(self.model, LSTMModel):
+            self.model.set_params(metadata['params'])
+            self.model.load(self._weights_path(path, metadata))
@@ -1,18 +1,19 @@
-import unittest
-import sys
 import os
+import shutil
+import tempfile
+import unittest
 
-# Add parent directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from app import app
+import app as service
+from app import app, extract_input_values
+from models.time_series_predictor import TimeSeriesPredictor
 
 
 class TestPythonService(unittest.TestCase):
     
-    def setUp(self):
-        self.app = app.test_client()
-        self.app.testing = True
+    @classmethod
+    def setUpClass(cls):
+        app.testing = True
+        cls.app = app.test_client()
     
     def test_health_check(self):
         """Test health check endpoint"""
@@ -22,6 +23,14 @@ class TestPythonService(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data['status'], 'healthy')
         self.assertEqual(data['service'], 'AI Time Machines Python Service')
+
+    def test_health_check_not_modified(self):
+        """Test health check endpoint honours If-None-Match"""
+        etag = self.app.get('/health').headers['ETag']
+
+        response = self.app.get('/health', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
     
     def test_model_types(self):
         """Test get model types endpoint"""
@@ -33,6 +42,92 @@ class TestPythonService(unittest.TestCase):
         self.assertIsInstance(data['models'], list)
         self.assertGreater(len(data['models']), 0)
 
+    def test_model_types_not_modified(self):
+        """Test model types endpoint honours If-None-Match"""
+        first = self.app.get('/api/models/types')
+        etag = first.headers['ETag']
+        self.assertEqual(first.headers['Cache-Control'], 'public, max-age=300')
+
+        response = self.app.get('/api/models/types', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_extract_input_values(self):
+        """Test input data is converted to a float array from either layout"""
+        points = [{'timestamp': '2024-01-01', 'value': 1}, {'timestamp': '2024-01-02', 'value': 2.5}]
+        columns = {'timestamps': ['2024-01-01', '2024-01-02'], 'values': [1, 2.5]}
+
+        for input_data in (points, columns, [1, 2.5]):
+            values = extract_input_values(input_data)
+            self.assertEqual(values.dtype, 'float64')
+            self.assertEqual(values.tolist(), [1.0, 2.5])
+
+
+class TestPredictorPool(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        service.predictor_pool.clear()
+        app.testing = True
+        self.app = app.test_client()
+
+    def tearDown(self):
+        service.predictor_pool.clear()
+        shutil.rmtree(self.tmpdir)
+
+    def save_model(self, name):
+        """Save a metadata-only model that loads without TensorFlow weights"""
+        path = os.path.join(self.tmpdir, f'{name}.json')
+        TimeSeriesPredictor(model_type='arima').save(path)
+        return path
+
+    def test_failed_load_is_not_pooled(self):
+        """Test a model that fails to load leaves no pool entry"""
+        legacy_path = os.path.join(self.tmpdir, 'legacy.pkl')
+        with open(legacy_path, 'wb') as f:
+            f.write(b'\x80\x04legacy')
+
+        response = self.app.post('/api/predict', json={'modelPath': legacy_path, 'inputData': [1, 2, 3]})
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('retrain', response.get_json()['error'])
+        self.assertEqual(len(service.predictor_pool), 0)
+
+    def test_pooled_predictor_reused_until_model_changes(self):
+        """Test a rewritten model file gets a freshly loaded predictor"""
+        path = self.save_model('model')
+
+        first, mtime = service.acquire_predictor(path, 'arima')
+        service.release_predictor(path, mtime, first)
+        second, mtime = service.acquire_predictor(path, 'arima')
+        self.assertIs(second, first)
+        service.release_predictor(path, mtime, second)
+
+        # Simulate retraining by bumping the metadata file's modification time
+        os.utime(path, (mtime + 10, mtime + 10))
+        third, _ = service.acquire_predictor(path, 'arima')
+        self.assertIsNot(third, first)
+
+    def test_stale_predictor_not_pooled_after_retrain(self):
+        """Test a predictor released after a retrain does not evict the fresh ones"""
+        path = self.save_model('model')
+        stale, old_mtime = service.acquire_predictor(path, 'arima')
+
+        os.utime(path, (old_mtime + 10, old_mtime + 10))
+        fresh, new_mtime = service.acquire_predictor(path, 'arima')
+        service.release_predictor(path, new_mtime, fresh)
+        service.release_predictor(path, old_mtime, stale)
+
+        self.assertEqual(service.predictor_pool[path], (new_mtime, [fresh]))
+        reused, _ = service.acquire_predictor(path, 'arima')
+        self.assertIs(reused, fresh)
+
+    def test_pool_is_bounded(self):
+        """Test the pool evicts least recently used models"""
+        paths = [self.save_model(f'model{i}') for i in range(service.MAX_POOLED_MODELS + 2)]
+        for path in paths:
+            predictors = [service.acquire_predictor(path, 'arima') for _ in range(3)]
+            for predictor, mtime in predictors:
+                service.release_predictor(path, mtime, predictor)
 
-if __name__ == '__main__':
-    unittest.main()
+        self.assertEqual(list(service.predictor_pool), paths[-service.MAX_POOLED_MODELS:])
+        for mtime, idle in service.predictor_pool.values():
+            self.assertLessEqual(len(idle), service.MAX_IDLE_PREDICTORS)
@@ -0,0 +1,95 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from models.lstm_model import LSTMModel
+from models.time_series_predictor import TimeSeriesPredictor
+
+
+class TestTimeSeriesPredictorPersistence(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.values = np.sin(np.arange(40) / 4) * 10 + 20
+        timestamps = pd.date_range('2024-01-01', periods=len(cls.values), freq='D')
+        data = [{'timestamp': str(ts), 'value': float(v)} for ts, v in zip(timestamps, cls.values)]
+
+        # Tiny network so training stays fast
+        cls.predictor = TimeSeriesPredictor(model_type='lstm')
+        cls.predictor.model = LSTMModel(sequence_length=5, units=4)
+        cls.predictor.train(data=data, model_id='tiny', hyperparameters={'epochs': 1})
+
+        cls.model_path = os.path.join(cls.tmpdir, 'tiny.json')
+        cls.predictor.save(cls.model_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def test_save_load_round_trip(self):
+        """Test a saved model restores its architecture, scaler and predictions"""
+        loaded = TimeSeriesPredictor()
+        loaded.load(self.model_path)
+
+        self.assertEqual(loaded.model_type, 'lstm')
+        self.assertEqual(loaded.model.sequence_length, 5)
+        self.assertEqual(loaded.model.units, 4)
+
+        original_scaler = self.predictor.model.scaler
+        for attr in ('min_', 'scale_', 'data_min_', 'data_max_', 'data_range_'):
+            np.testing.assert_array_equal(getattr(loaded.model.scaler, attr), getattr(original_scaler, attr))
+
+        predictions, confidence = loaded.predict(self.values, horizon=4)
+        self.assertEqual(predictions.shape, (4,))
+        self.assertTrue(np.all(np.isfinite(predictions)))
+        np.testing.assert_allclose(confidence['lower'], predictions * 0.9)
+        np.testing.assert_allclose(confidence['upper'], predictions * 1.1)
+
+    def test_tflite_matches_keras(self):
+        """Test the quantized TFLite rollout tracks Keras and keeps no state between calls"""
+        loaded = TimeSeriesPredictor()
+        loaded.load(self.model_path)
+        self.assertIsNotNone(loaded.model.interpreter)
+        self.assertIsNone(loaded.model.model)
+
+        keras_predictions = self.predictor.model.predict(self.values, horizon=4)
+        tflite_predictions = loaded.model.predict(self.values, horizon=4)
+        # int8 weights: allow 1% of the training value range
+        np.testing.assert_allclose(tflite_predictions, keras_predictions, atol=0.2)
+
+        # Repeated rollouts must not inherit LSTM state from earlier invocations
+        np.testing.assert_array_equal(loaded.model.predict(self.values, horizon=4), tflite_predictions)
+
+    def test_resave_swaps_weights(self):
+        """Test re-saving points the metadata at new weights and removes the old ones"""
+        path = os.path.join(self.tmpdir, 'resave.json')
+        self.predictor.save(path)
+        before = set(os.listdir(self.tmpdir))
+        self.predictor.save(path)
+        after = set(os.listdir(self.tmpdir))
+
+        removed, added = before - after, after - before
+        self.assertEqual(len(removed), 2)
+        self.assertEqual({os.path.splitext(name)[1] for name in added}, {'.keras', '.tflite'})
+        self.assertFalse(any(name.endswith('.tmp') for name in after))
+
+        loaded = TimeSeriesPredictor()
+        loaded.load(path)
+        predictions, _ = loaded.predict(self.values, horizon=2)
+        self.assertEqual(predictions.shape, (2,))
+
+    def test_load_legacy_pickle(self):
+        """Test loading a joblib-era model asks for retraining"""
+        legacy_path = os.path.join(self.tmpdir, 'legacy.bin')
+        with open(legacy_path, 'wb') as f:
+            pickle.dump({'model_type': 'lstm'}, f)
+
+        for path in (legacy_path, os.path.join(self.tmpdir, 'missing.pkl')):
+            with self.assertRaisesRegex(ValueError, 'legacy pickle format; retrain it'):
+                TimeSeriesPredictor().load(path)